@@ -644,19 +644,30 @@ pub fn has_any_jinja_block_syntax(s: &str) -> bool {
 /// `{{ }}` expressions in quoted strings are untouched.
 /// Returns the stripped content with the original trailing newline preserved.
 pub fn strip_jinja_blocks(source: &str) -> String {
-    let result: Vec<&str> = source
-        .lines()
-        .filter(|line| {
-            let trimmed = line.trim();
-            !(trimmed.starts_with("{%") && trimmed.ends_with("%}"))
-        })
-        .collect();
-    let joined = result.join("\n");
+    // Fast path: without `{%` no line can be stripped, and without `\r` the
+    // line-by-line rebuild below would reproduce the input byte for byte.
+    if !source.contains("{%") && !source.contains('\r') {
+        return source.to_owned();
+    }
+
+    // Single pass into one pre-sized buffer (no intermediate Vec + join).
+    let mut out = String::with_capacity(source.len());
+    let mut first = true;
+    for line in source.lines() {
+        let trimmed = line.trim();
+        if trimmed.starts_with("{%") && trimmed.ends_with("%}") {
+            continue;
+        }
+        if !first {
+            out.push('\n');
+        }
+        first = false;
+        out.push_str(line);
+    }
     if source.ends_with('\n') {
-        joined + "\n"
-    } else {
-        joined
+        out.push('\n');
     }
+    out
 }
 
 /// Validates Jinja syntax without rendering (no context needed).
@@ -677,6 +688,18 @@ pub fn validate_jinja_syntax<'src>(
     Ok(())
 }
 
+/// Validates many `(source, filename)` pairs in parallel on the rayon pool.
+/// Results are returned in input order, one per pair.
+pub fn validate_jinja_syntax_many<'src>(
+    files: &[(&'src str, &str)],
+) -> Vec<Result<(), RenderDiagnostic<'src>>> {
+    use rayon::prelude::*;
+    files
+        .par_iter()
+        .map(|&(source, filename)| validate_jinja_syntax(source, filename))
+        .collect()
+}
+
 /// Converts a minijinja::Error into a RenderDiagnostic with zero-copy source reference.
 fn build_render_diagnostic<'src>(
     source: &'src str,
@@ -1481,6 +1504,19 @@ mod tests {
         assert!(!stripped2.ends_with('\n'));
     }
 
+    #[test]
+    fn test_strip_jinja_blocks_normalizes_crlf() {
+        let source = "name: test\r\n{% if x %}\r\nfoo\r\n{% endif %}\r\n";
+        assert_eq!(strip_jinja_blocks(source), "name: test\nfoo\n");
+        assert_eq!(strip_jinja_blocks("a\r\nb\r\n"), "a\nb\n");
+    }
+
+    #[test]
+    fn test_strip_jinja_blocks_keeps_leading_empty_line() {
+        let source = "\n{% if x %}\nfoo\n{% endif %}\n";
+        assert_eq!(strip_jinja_blocks(source), "\nfoo\n");
+    }
+
     #[test]
     fn test_strip_jinja_blocks_preserves_expressions() {
         let source = "  \"bucket{{ i }}\":\n    name: \"{{ project }}-{{ i }}\"\n";
@@ -1496,6 +1532,20 @@ mod tests {
         assert!(validate_jinja_syntax(source, "test.yaml").is_ok());
     }
 
+    #[test]
+    fn test_validate_jinja_syntax_many_preserves_order() {
+        let files = [
+            ("name: {{ var }}\n", "a.yaml"),
+            ("{% for x in items %}\nhello\n", "b.yaml"),
+            ("name: test\n", "c.yaml"),
+        ];
+        let results = validate_jinja_syntax_many(&files);
+        assert_eq!(results.len(), 3);
+        assert!(results[0].is_ok());
+        assert!(results[1].is_err());
+        assert!(results[2].is_ok());
+    }
+
     #[test]
     fn test_validate_jinja_syntax_plain_yaml() {
         let source = "name: test\nruntime: yaml\n";
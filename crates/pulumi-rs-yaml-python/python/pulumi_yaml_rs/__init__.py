@@ -1,29 +1,30 @@
 # Copyright (c) 2024-2026 Lituus-io. All rights reserved.
 
-from pulumi_yaml_rs._native import (
-    parse_template,
-    load_project,
-    discover_project_files,
-    has_jinja_blocks,
-    strip_jinja_blocks,
-    validate_jinja,
-    preprocess_jinja,
-    evaluate_builtin,
-    create_execution_plan,
-    export_dependency_graph,
-    validate_and_classify,
-    type_check_project,
-    complete_properties,
-    get_resource_schema,
-)
-
-try:  # optional: requires the `sql-lineage` build feature
-    from pulumi_yaml_rs._native import export_sql_lineage
-except ImportError:  # pragma: no cover - feature-disabled builds
-    export_sql_lineage = None
+import importlib
+from typing import TYPE_CHECKING
 
 from pulumi_yaml_rs._find_binary import find_language_binary, find_converter_binary
 
+if TYPE_CHECKING:
+    from pulumi_yaml_rs._native import (
+        parse_template,
+        load_project,
+        discover_project_files,
+        has_jinja_blocks,
+        strip_jinja_blocks,
+        validate_jinja,
+        validate_many,
+        preprocess_jinja,
+        evaluate_builtin,
+        create_execution_plan,
+        export_dependency_graph,
+        export_sql_lineage,
+        validate_and_classify,
+        type_check_project,
+        complete_properties,
+        get_resource_schema,
+    )
+
 __all__ = [
     "parse_template",
     "load_project",
@@ -31,6 +32,7 @@ __all__ = [
     "has_jinja_blocks",
     "strip_jinja_blocks",
     "validate_jinja",
+    "validate_many",
     "preprocess_jinja",
     "evaluate_builtin",
     "create_execution_plan",
@@ -43,3 +45,29 @@ __all__ = [
     "find_language_binary",
     "find_converter_binary",
 ]
+
+# Native symbols are resolved on first access (PEP 562) so the console-script
+# entry points in cli.py never pay for loading the _native extension before
+# they exec the bundled binary.
+_NATIVE_NAMES = frozenset(__all__) - {"find_language_binary", "find_converter_binary"}
+
+# optional: requires the `sql-lineage` build feature
+_OPTIONAL_NATIVE_NAMES = frozenset({"export_sql_lineage"})
+
+
+def __getattr__(name):
+    if name not in _NATIVE_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    native = importlib.import_module("._native", __name__)
+    try:
+        value = getattr(native, name)
+    except AttributeError:
+        if name not in _OPTIONAL_NATIVE_NAMES:
+            raise
+        value = None  # feature-disabled builds
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_NATIVE_NAMES})
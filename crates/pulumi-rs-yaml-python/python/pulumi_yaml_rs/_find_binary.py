@@ -1,24 +1,40 @@
 # Copyright (c) 2024-2026 Lituus-io. All rights reserved.
 
 import os
+import stat
 import sysconfig
 
-_BIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin")
+# __file__ is already absolute for installed packages; only fall back to
+# abspath (getcwd + normpath) for unusual relative imports.
+_PKG_DIR = os.path.dirname(__file__ if os.path.isabs(__file__) else os.path.abspath(__file__))
+_BIN_DIR = os.path.join(_PKG_DIR, "bin")
+_EXE_SUFFIX = sysconfig.get_config_var("EXE") or ""
 
 
-def _exe_suffix():
-    return sysconfig.get_config_var("EXE") or ""
+def _is_executable_file(path):
+    # One stat answers both "is it a regular file" and "is it executable".
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return False
+    return stat.S_ISREG(mode) and bool(mode & stat.S_IXUSR)
+
+
+# The package layout is frozen after install, so both binaries are probed
+# once at import and every lookup afterwards is syscall-free.
+_LANG_BIN_PATH = os.path.join(_BIN_DIR, "pulumi-language-yaml" + _EXE_SUFFIX)
+_LANG_BIN_OK = _is_executable_file(_LANG_BIN_PATH)
+_CONV_BIN_PATH = os.path.join(_BIN_DIR, "pulumi-converter-yaml" + _EXE_SUFFIX)
+_CONV_BIN_OK = _is_executable_file(_CONV_BIN_PATH)
 
 
 def find_language_binary():
-    path = os.path.join(_BIN_DIR, "pulumi-language-yaml" + _exe_suffix())
-    if not os.path.isfile(path):
-        raise FileNotFoundError(f"binary not found at {path}")
-    return path
+    if not _LANG_BIN_OK:
+        raise FileNotFoundError(f"binary not found at {_LANG_BIN_PATH}")
+    return _LANG_BIN_PATH
 
 
 def find_converter_binary():
-    path = os.path.join(_BIN_DIR, "pulumi-converter-yaml" + _exe_suffix())
-    if not os.path.isfile(path):
-        raise FileNotFoundError(f"binary not found at {path}")
-    return path
+    if not _CONV_BIN_OK:
+        raise FileNotFoundError(f"binary not found at {_CONV_BIN_PATH}")
+    return _CONV_BIN_PATH
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Mapping, Optional
 
 def parse_template(source: str) -> dict[str, Any]: ...
 def load_project(dir: str) -> dict[str, Any]: ...
@@ -6,7 +6,8 @@ def discover_project_files(dir: str) -> dict[str, Any]: ...
 def has_jinja_blocks(source: str) -> bool: ...
 def strip_jinja_blocks(source: str) -> str: ...
 def validate_jinja(source: str, filename: str) -> None: ...
-def preprocess_jinja(source: str, filename: str, context: dict[str, Any]) -> str: ...
+def validate_many(sources: list[str], filenames: list[str]) -> list[Optional[str]]: ...
+def preprocess_jinja(source: str, filename: str, context: Mapping[str, str]) -> str: ...
 def evaluate_builtin(name: str, args: Any) -> Any: ...
 def create_execution_plan(project_dir: str, jinja_context: Optional[dict[str, Any]] = None) -> dict[str, Any]: ...
 def export_dependency_graph(project_dir: str, stack: str, organization: str = "", jinja_context: Optional[dict[str, Any]] = None, schema_dir: Optional[str] = None) -> dict[str, Any]: ...
@@ -3,28 +3,31 @@
 import os
 import sys
 
-
-def _exec_binary(binary_path):
-    if sys.platform == "win32":
-        import subprocess
-        sys.exit(subprocess.run([binary_path, *sys.argv[1:]]).returncode)
-    else:
-        os.execvp(binary_path, [binary_path, *sys.argv[1:]])
+# The exec is inlined into each entry point so the POSIX launch path is a
+# single Python frame; subprocess is only imported on Windows, which has no
+# process-replacing exec.
 
 
 def language_main():
     from pulumi_yaml_rs._find_binary import find_language_binary
-    _exec_binary(find_language_binary())
+    binary_path = find_language_binary()
+    if sys.platform == "win32":
+        import subprocess
+        sys.exit(subprocess.run([binary_path, *sys.argv[1:]]).returncode)
+    os.execv(binary_path, [binary_path, *sys.argv[1:]])
 
 
 def converter_main():
     from pulumi_yaml_rs._find_binary import find_converter_binary
-    _exec_binary(find_converter_binary())
+    binary_path = find_converter_binary()
+    if sys.platform == "win32":
+        import subprocess
+        sys.exit(subprocess.run([binary_path, *sys.argv[1:]]).returncode)
+    os.execv(binary_path, [binary_path, *sys.argv[1:]])
 
 
 def main():
     if len(sys.argv) > 1 and sys.argv[1] == "converter":
-        sys.argv = [sys.argv[0]] + sys.argv[2:]
-        converter_main()
-    else:
-        language_main()
+        del sys.argv[1]
+        return converter_main()
+    return language_main()
@@ -10,7 +10,7 @@ use pulumi_rs_yaml_core::ast::template::{PropertyEntry, ResourceOptionsDecl, Res
 use pulumi_rs_yaml_core::eval::value::Value;
 use pulumi_rs_yaml_core::packages::canonicalize_type_token;
 use pyo3::prelude::*;
-use pyo3::types::{PyBool, PyDict, PyFloat, PyInt, PyList, PyString};
+use pyo3::types::{PyBool, PyDict, PyFloat, PyInt, PyList, PyMapping, PyString};
 
 /// Converts a Rust `Value` to a Python object.
 pub fn value_to_py(py: Python<'_>, val: &Value<'_>) -> PyResult<Py<PyAny>> {
@@ -103,6 +103,21 @@ pub fn py_dict_to_string_map(dict: &Bound<'_, PyDict>) -> PyResult<HashMap<Strin
     Ok(map)
 }
 
+/// Converts any Python mapping (e.g. a `MappingProxyType`) to `HashMap<String, String>`.
+pub fn py_mapping_to_string_map(
+    mapping: &Bound<'_, PyMapping>,
+) -> PyResult<HashMap<String, String>> {
+    if let Ok(dict) = mapping.cast::<PyDict>() {
+        return py_dict_to_string_map(dict);
+    }
+    let mut map = HashMap::new();
+    for item in mapping.items()?.iter() {
+        let (key, val): (String, String) = item.extract()?;
+        map.insert(key, val);
+    }
+    Ok(map)
+}
+
 // =============================================================================
 // Expr → Python dict serialization
 // =============================================================================
@@ -6,15 +6,15 @@ use std::collections::HashMap;
 
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
-use pyo3::types::PyDict;
+use pyo3::types::{PyDict, PyMapping};
 
 use pulumi_rs_yaml_core::diag::Diagnostics;
 use pulumi_rs_yaml_core::eval::builtins;
 use pulumi_rs_yaml_core::eval::value::Value;
 
 use convert::{
-    expr_to_py, json_to_py, py_dict_to_string_map, py_to_value, resource_options_to_py,
-    resource_properties_to_py, value_to_py,
+    expr_to_py, json_to_py, py_dict_to_string_map, py_mapping_to_string_map, py_to_value,
+    resource_options_to_py, resource_properties_to_py, value_to_py,
 };
 
 /// Parse a YAML template string and return its structure as a Python dict.
@@ -131,10 +131,45 @@ fn validate_jinja(source: &str, filename: &str) -> PyResult<()> {
     }
 }
 
+/// Validate Jinja syntax for many sources at once, in parallel.
+///
+/// Returns one entry per source, in order: `None` when the source is valid,
+/// otherwise the error message `validate_jinja` would have raised.
+#[pyfunction]
+fn validate_many(
+    py: Python<'_>,
+    sources: Vec<String>,
+    filenames: Vec<String>,
+) -> PyResult<Vec<Option<String>>> {
+    if sources.len() != filenames.len() {
+        return Err(PyValueError::new_err(format!(
+            "sources and filenames differ in length ({} vs {})",
+            sources.len(),
+            filenames.len()
+        )));
+    }
+    let results = py.detach(|| {
+        let files: Vec<(&str, &str)> = sources
+            .iter()
+            .map(String::as_str)
+            .zip(filenames.iter().map(String::as_str))
+            .collect();
+        pulumi_rs_yaml_core::jinja::validate_jinja_syntax_many(&files)
+            .into_iter()
+            .map(|r| r.err().map(|e| format!("Jinja syntax error: {}", e)))
+            .collect::<Vec<_>>()
+    });
+    Ok(results)
+}
+
 /// Preprocess a YAML source with Jinja rendering.
 #[pyfunction]
-fn preprocess_jinja(source: &str, filename: &str, context: &Bound<'_, PyDict>) -> PyResult<String> {
-    let ctx_map = py_dict_to_string_map(context)?;
+fn preprocess_jinja(
+    source: &str,
+    filename: &str,
+    context: &Bound<'_, PyMapping>,
+) -> PyResult<String> {
+    let ctx_map = py_mapping_to_string_map(context)?;
 
     // Build owned strings, then borrow for JinjaContext
     let project_name = ctx_map.get("project_name").cloned().unwrap_or_default();
@@ -241,6 +276,26 @@ fn evaluate_builtin(py: Python<'_>, name: &str, args: Py<PyAny>) -> PyResult<Py<
                 ));
             }
         },
+        // Batch form of select: one boundary crossing for many indices.
+        "select_many" => match &arg_val {
+            Value::List(items) if items.len() == 2 => match &items[0] {
+                Value::List(indices) => indices
+                    .iter()
+                    .map(|idx| builtins::eval_select(idx, &items[1], &mut diags))
+                    .collect::<Option<Vec<_>>>()
+                    .map(Value::List),
+                _ => {
+                    return Err(PyValueError::new_err(
+                        "select_many expects a list of [indices, list]",
+                    ));
+                }
+            },
+            _ => {
+                return Err(PyValueError::new_err(
+                    "select_many expects a list of [indices, list]",
+                ));
+            }
+        },
         "toJSON" => builtins::eval_to_json(&arg_val, &mut diags),
         "toBase64" => builtins::eval_to_base64(&arg_val, &mut diags),
         "fromBase64" => builtins::eval_from_base64(&arg_val, &mut diags),
@@ -1032,6 +1087,7 @@ fn _native(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(has_jinja_blocks, m)?)?;
     m.add_function(wrap_pyfunction!(strip_jinja_blocks, m)?)?;
     m.add_function(wrap_pyfunction!(validate_jinja, m)?)?;
+    m.add_function(wrap_pyfunction!(validate_many, m)?)?;
     m.add_function(wrap_pyfunction!(preprocess_jinja, m)?)?;
     m.add_function(wrap_pyfunction!(evaluate_builtin, m)?)?;
     m.add_function(wrap_pyfunction!(create_execution_plan, m)?)?;
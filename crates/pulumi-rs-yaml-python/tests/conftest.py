@@ -2,40 +2,209 @@
 
 """Shared fixtures for pulumi_yaml_rs test suite."""
 
+import functools
 import os
+import shutil
 import textwrap
 from pathlib import Path
 
 import pytest
 
+# Test modules pass the same indented literals to tmp_project over and over.
+@functools.lru_cache(maxsize=128)
+def _dedent_bytes(source: str) -> bytes:
+    """Dedented, UTF-8 encoded source, ready for a single write_bytes()."""
+    return textwrap.dedent(source).encode("utf-8")
+
+
+# Fixture templates are dedented once at import rather than per test.
+_SIMPLE_YAML = textwrap.dedent("""\
+    name: test
+    runtime: yaml
+""")
+
+_MULTI_RESOURCE_YAML = textwrap.dedent("""\
+    name: multi-test
+    runtime: yaml
+    description: Multi-resource test
+    variables:
+      greeting:
+        fn::toBase64: hello
+    resources:
+      bucketA:
+        type: gcp:storage:Bucket
+        properties:
+          name: bucket-a
+          location: US
+      bucketB:
+        type: gcp:storage:Bucket
+        properties:
+          name: bucket-b
+          location: US
+    outputs:
+      nameA: ${bucketA.name}
+      nameB: ${bucketB.name}
+""")
+
+_JINJA_YAML = textwrap.dedent("""\
+    name: jinja-expr-test
+    runtime: yaml
+    resources:
+      bucket:
+        type: gcp:storage:Bucket
+        properties:
+          name: "{{ pulumi_project }}-{{ pulumi_stack }}-bucket"
+          location: US
+""")
+
+_JINJA_BLOCK_YAML = textwrap.dedent("""\
+    name: jinja-block-test
+    runtime: yaml
+    resources:
+    {% for i in range(2) %}
+      bucket{{ i }}:
+        type: gcp:storage:Bucket
+        properties:
+          name: "bucket-{{ i }}"
+          location: US
+    {% endfor %}
+""")
+
+
+# Modules that must run without loading _native (binary discovery, console scripts).
+_NATIVE_FREE_MODULES = frozenset({"test_cli_integration.py"})
+
+
+@pytest.fixture(scope="session")
+def _native_warmed():
+    """Load _native and touch the hot entry points once per session.
+
+    The one-time cost is charged to the setup phase of the first test that
+    needs it, instead of to that test's call phase.
+    """
+    import pulumi_yaml_rs
+
+    pulumi_yaml_rs.has_jinja_blocks("")
+    pulumi_yaml_rs.strip_jinja_blocks("")
+    pulumi_yaml_rs.parse_template(_SIMPLE_YAML)
+    pulumi_yaml_rs.evaluate_builtin("select", [0, [None]])
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _warm_native(request):
+    """Request _native_warmed for every module except the native-free ones."""
+    if request.path.name not in _NATIVE_FREE_MODULES:
+        request.getfixturevalue("_native_warmed")
+
+
+_ACCEPTANCE_DIR = Path(__file__).resolve().parent.parent.parent.parent / "tests" / "acceptance"
+
+# Jinja projects need a context, and the multi-phase projects' Pulumi.phase*.yaml
+# files are standalone projects (not multi-file extras), so neither plans as-is.
+_PLAN_SKIP_DIRS = {
+    "gcp-jinja-bucket",
+    "gcp-jinja-single-line",
+    "gcp-multi-file-jinja",
+    "gcp-exec-jinja-bucket",
+    "gcp-get-resource",
+}
+
+
+@functools.cache
+def all_acceptance_dirs(acceptance_dir=_ACCEPTANCE_DIR):
+    """All subdirectories in the acceptance test fixtures with a Pulumi.yaml.
+
+    Scanned once per process: collection-time parametrization and the
+    session fixture share the result.
+    """
+    with os.scandir(acceptance_dir) as it:
+        return tuple(sorted(
+            Path(entry.path)
+            for entry in it
+            if entry.is_dir(follow_symlinks=False)
+            and os.path.isfile(os.path.join(entry.path, "Pulumi.yaml"))
+        ))
+
+
+def pytest_generate_tests(metafunc):
+    # One test item per acceptance project, so failures are reported
+    # independently and pytest-xdist can shard the planner calls.
+    if "acceptance_project" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "acceptance_project",
+            [
+                pytest.param(
+                    d,
+                    id=d.name,
+                    marks=pytest.mark.skipif(
+                        d.name in _PLAN_SKIP_DIRS,
+                        reason="needs Jinja context or is multi-phase",
+                    ),
+                )
+                for d in all_acceptance_dirs()
+            ],
+        )
+
 
 @pytest.fixture
 def acceptance_dir():
     """Path to the acceptance test fixtures (17 real project directories)."""
-    p = Path(__file__).resolve().parent.parent.parent.parent / "tests" / "acceptance"
-    assert p.is_dir(), f"acceptance dir not found: {p}"
-    return p
+    assert _ACCEPTANCE_DIR.is_dir(), f"acceptance dir not found: {_ACCEPTANCE_DIR}"
+    return _ACCEPTANCE_DIR
+
+
+@pytest.fixture(scope="session")
+def acceptance_project_dirs():
+    """All acceptance project directories that contain a Pulumi.yaml."""
+    return list(all_acceptance_dirs())
+
+
+@pytest.fixture(scope="module")
+def _module_project_dir(tmp_path_factory):
+    """One project directory per test module, emptied by tmp_project per test."""
+    return tmp_path_factory.mktemp("project")
 
 
 @pytest.fixture
-def tmp_project(tmp_path):
+def tmp_project(_module_project_dir):
     """Factory that creates temp directories with Pulumi.yaml content.
 
+    The directory is shared by every test in a module and emptied before each
+    test, which avoids a fresh mkdir per test.
+
     Usage:
         project_dir = tmp_project("name: test\\nruntime: yaml")
         project_dir = tmp_project(main="...", extras={"Pulumi.storage.yaml": "..."})
     """
+    project_dir = _module_project_dir
+    for entry in project_dir.iterdir():
+        if entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink()
 
     def _create(main: str, extras: dict[str, str] | None = None):
-        (tmp_path / "Pulumi.yaml").write_text(textwrap.dedent(main))
+        (project_dir / "Pulumi.yaml").write_bytes(_dedent_bytes(main))
         if extras:
             for name, content in extras.items():
-                (tmp_path / name).write_text(textwrap.dedent(content))
-        return str(tmp_path)
+                (project_dir / name).write_bytes(_dedent_bytes(content))
+        return str(project_dir)
 
     return _create
 
 
+@pytest.fixture(scope="session")
+def cached_parse():
+    """parse_template() memoized per session on the source string.
+
+    Tests that parse the same shared YAML fixture share one Rust call.
+    Returned dicts are shared by reference — treat them as read-only.
+    """
+    from pulumi_yaml_rs import parse_template
+
+    return functools.lru_cache(maxsize=64)(parse_template)
+
+
 @pytest.fixture
 def jinja_context():
     """Default JinjaContext dict for Jinja tests."""
@@ -48,66 +217,22 @@ def jinja_context():
 @pytest.fixture
 def simple_yaml():
     """Minimal valid YAML template string."""
-    return textwrap.dedent("""\
-        name: test
-        runtime: yaml
-    """)
+    return _SIMPLE_YAML
 
 
 @pytest.fixture
 def multi_resource_yaml():
     """YAML with 2 resources, a variable, and outputs."""
-    return textwrap.dedent("""\
-        name: multi-test
-        runtime: yaml
-        description: Multi-resource test
-        variables:
-          greeting:
-            fn::toBase64: hello
-        resources:
-          bucketA:
-            type: gcp:storage:Bucket
-            properties:
-              name: bucket-a
-              location: US
-          bucketB:
-            type: gcp:storage:Bucket
-            properties:
-              name: bucket-b
-              location: US
-        outputs:
-          nameA: ${bucketA.name}
-          nameB: ${bucketB.name}
-    """)
+    return _MULTI_RESOURCE_YAML
 
 
 @pytest.fixture
 def jinja_yaml():
     """YAML with {{ }} expressions (no block-level Jinja)."""
-    return textwrap.dedent("""\
-        name: jinja-expr-test
-        runtime: yaml
-        resources:
-          bucket:
-            type: gcp:storage:Bucket
-            properties:
-              name: "{{ pulumi_project }}-{{ pulumi_stack }}-bucket"
-              location: US
-    """)
+    return _JINJA_YAML
 
 
 @pytest.fixture
 def jinja_block_yaml():
     """YAML with {% %} blocks."""
-    return textwrap.dedent("""\
-        name: jinja-block-test
-        runtime: yaml
-        resources:
-        {% for i in range(2) %}
-          bucket{{ i }}:
-            type: gcp:storage:Bucket
-            properties:
-              name: "bucket-{{ i }}"
-              location: US
-        {% endfor %}
-    """)
+    return _JINJA_BLOCK_YAML
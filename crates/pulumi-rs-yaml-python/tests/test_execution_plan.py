@@ -5,25 +5,33 @@
 import pytest
 from pulumi_yaml_rs import create_execution_plan
 
+BUCKET = """\
+name: bucket-plan
+runtime: yaml
+resources:
+  bucket:
+    type: gcp:storage:Bucket
+    properties:
+      name: my-bucket
+"""
+
+
+@pytest.fixture(scope="class")
+def bucket_plan(tmp_path_factory):
+    """Plan for BUCKET, built once per test class that asserts on it."""
+    d = tmp_path_factory.mktemp("bucket-plan")
+    (d / "Pulumi.yaml").write_text(BUCKET)
+    return create_execution_plan(str(d))
+
 
 class TestPlanBasicStructure:
-    def test_plan_basic_structure(self, tmp_project):
-        d = tmp_project("""\
-            name: plan-test
-            runtime: yaml
-            resources:
-              bucket:
-                type: gcp:storage:Bucket
-                properties:
-                  name: my-bucket
-        """)
-        plan = create_execution_plan(d)
-        assert "project_name" in plan
-        assert "nodes" in plan
-        assert "outputs" in plan
-        assert "source_map" in plan
-        assert "diagnostics" in plan
-        assert "levels" in plan
+    def test_plan_basic_structure(self, bucket_plan):
+        assert "project_name" in bucket_plan
+        assert "nodes" in bucket_plan
+        assert "outputs" in bucket_plan
+        assert "source_map" in bucket_plan
+        assert "diagnostics" in bucket_plan
+        assert "levels" in bucket_plan
 
     def test_plan_project_name(self, tmp_project):
         d = tmp_project("""\
@@ -63,33 +71,13 @@ class TestPlanNodes:
         assert var_nodes[0]["name"] == "encoded"
         assert var_nodes[0]["value"] is not None
 
-    def test_plan_resource_nodes(self, tmp_project):
-        d = tmp_project("""\
-            name: res-plan
-            runtime: yaml
-            resources:
-              bucket:
-                type: gcp:storage:Bucket
-                properties:
-                  name: my-bucket
-        """)
-        plan = create_execution_plan(d)
-        res_nodes = [n for n in plan["nodes"] if n["kind"] == "resource"]
+    def test_plan_resource_nodes(self, bucket_plan):
+        res_nodes = [n for n in bucket_plan["nodes"] if n["kind"] == "resource"]
         assert len(res_nodes) == 1
         assert res_nodes[0]["name"] == "bucket"
 
-    def test_plan_type_token_canonicalized(self, tmp_project):
-        d = tmp_project("""\
-            name: token-plan
-            runtime: yaml
-            resources:
-              bucket:
-                type: gcp:storage:Bucket
-                properties:
-                  name: my-bucket
-        """)
-        plan = create_execution_plan(d)
-        res = [n for n in plan["nodes"] if n["kind"] == "resource"][0]
+    def test_plan_type_token_canonicalized(self, bucket_plan):
+        res = [n for n in bucket_plan["nodes"] if n["kind"] == "resource"][0]
         # gcp:storage:Bucket → gcp:storage/bucket:Bucket
         assert res["type_token"] == "gcp:storage/bucket:Bucket"
 
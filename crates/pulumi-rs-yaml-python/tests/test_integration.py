@@ -8,32 +8,18 @@ import pytest
 from pulumi_yaml_rs import create_execution_plan, load_project
 
 
-def all_acceptance_dirs(acceptance_dir):
-    """Yield all subdirectories in the acceptance test fixtures."""
-    for entry in sorted(acceptance_dir.iterdir()):
-        if entry.is_dir() and (entry / "Pulumi.yaml").exists():
-            yield entry
-
-
 class TestAllAcceptanceProjects:
-    def test_all_acceptance_projects_parse(self, acceptance_dir):
-        dirs = list(all_acceptance_dirs(acceptance_dir))
+    def test_all_acceptance_projects_parse(self, acceptance_project_dirs):
+        dirs = acceptance_project_dirs
         assert len(dirs) >= 15, f"Expected ≥15 acceptance dirs, got {len(dirs)}"
         for d in dirs:
             result = load_project(str(d))
             assert "has_errors" in result, f"Missing has_errors for {d.name}"
 
-    def test_all_acceptance_projects_plan(self, acceptance_dir):
-        dirs = list(all_acceptance_dirs(acceptance_dir))
-        # Skip Jinja projects that need context and multi-phase projects
-        # whose Pulumi.phase*.yaml files are standalone projects (not multi-file extras)
-        jinja_dirs = {"gcp-jinja-bucket", "gcp-jinja-single-line", "gcp-multi-file-jinja", "gcp-exec-jinja-bucket", "gcp-get-resource"}
-        for d in dirs:
-            if d.name in jinja_dirs:
-                continue
-            plan = create_execution_plan(str(d))
-            assert "nodes" in plan, f"Missing nodes for {d.name}"
-            assert "levels" in plan, f"Missing levels for {d.name}"
+    def test_all_acceptance_projects_plan(self, acceptance_project):
+        plan = create_execution_plan(str(acceptance_project))
+        assert "nodes" in plan, f"Missing nodes for {acceptance_project.name}"
+        assert "levels" in plan, f"Missing levels for {acceptance_project.name}"
 
 
 class TestSpecificFixtures:
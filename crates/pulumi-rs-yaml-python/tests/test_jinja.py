@@ -2,14 +2,22 @@
 
 """Tests for Jinja functions: has_jinja_blocks, strip_jinja_blocks, validate_jinja, preprocess_jinja."""
 
+from types import MappingProxyType
+
 import pytest
 from pulumi_yaml_rs import (
     has_jinja_blocks,
     preprocess_jinja,
     strip_jinja_blocks,
     validate_jinja,
+    validate_many,
 )
 
+# Read-only contexts shared by every test instead of rebuilt per call.
+_CTX_DEFAULT = MappingProxyType({"project_name": "test", "stack_name": "dev"})
+_CTX_CONFIG = MappingProxyType({**_CTX_DEFAULT, "config.env": "prod"})
+_CTX_FIXTURE = MappingProxyType({"project_name": "gcp-jinja-bucket-test", "stack_name": "dev"})
+
 
 class TestHasJinjaBlocks:
     def test_has_jinja_blocks_true(self):
@@ -87,6 +95,20 @@ class TestValidateJinja:
         validate_jinja(simple_yaml, "test.yaml")
 
 
+class TestValidateMany:
+    def test_validate_many_reports_per_source(self, jinja_block_yaml, simple_yaml):
+        sources = [jinja_block_yaml, "{% for x in items %}\nhello\n", simple_yaml]
+        names = ["a.yaml", "b.yaml", "c.yaml"]
+        results = validate_many(sources, names)
+        assert results[0] is None
+        assert results[1] is not None and "Jinja syntax error" in results[1]
+        assert results[2] is None
+
+    def test_validate_many_length_mismatch(self):
+        with pytest.raises(ValueError):
+            validate_many(["name: test\n"], [])
+
+
 class TestPreprocessJinja:
     def test_preprocess_substitutes_variables(self, jinja_context):
         source = 'name: "{{ pulumi_project }}"\nruntime: yaml\n'
@@ -95,12 +117,7 @@ class TestPreprocessJinja:
 
     def test_preprocess_config_variables(self):
         source = 'env: "{{ config.env }}"\n'
-        context = {
-            "project_name": "test",
-            "stack_name": "dev",
-            "config.env": "prod",
-        }
-        result = preprocess_jinja(source, "test.yaml", context)
+        result = preprocess_jinja(source, "test.yaml", _CTX_CONFIG)
         assert "prod" in result
 
     def test_preprocess_loop_expansion(self, jinja_context):
@@ -118,15 +135,13 @@ resources:
 
     def test_preprocess_missing_context_key(self):
         source = 'name: "{{ unknown_var }}"\n'
-        context = {"project_name": "test", "stack_name": "dev"}
         with pytest.raises(ValueError):
-            preprocess_jinja(source, "test.yaml", context)
+            preprocess_jinja(source, "test.yaml", _CTX_DEFAULT)
 
     def test_preprocess_real_jinja_fixture(self, acceptance_dir):
         fixture = acceptance_dir / "gcp-jinja-bucket" / "Pulumi.yaml"
         source = fixture.read_text()
-        context = {"project_name": "gcp-jinja-bucket-test", "stack_name": "dev"}
-        result = preprocess_jinja(source, "Pulumi.yaml", context)
+        result = preprocess_jinja(source, "Pulumi.yaml", _CTX_FIXTURE)
         # Jinja expressions should be rendered
         assert "{{ pulumi_project }}" not in result
         assert "{{ pulumi_stack }}" not in result
@@ -7,16 +7,16 @@ from pulumi_yaml_rs import parse_template
 
 
 class TestParseMinimal:
-    def test_parse_minimal_template(self, simple_yaml):
-        result = parse_template(simple_yaml)
+    def test_parse_minimal_template(self, cached_parse, simple_yaml):
+        result = cached_parse(simple_yaml)
         assert result["name"] == "test"
         assert result["resource_count"] == 0
         assert result["variable_count"] == 0
         assert result["output_count"] == 0
         assert result["has_errors"] is False
 
-    def test_parse_name_and_description(self, multi_resource_yaml):
-        result = parse_template(multi_resource_yaml)
+    def test_parse_name_and_description(self, cached_parse, multi_resource_yaml):
+        result = cached_parse(multi_resource_yaml)
         assert result["name"] == "multi-test"
         assert result["description"] == "Multi-resource test"
 
@@ -26,18 +26,18 @@ class TestParseMinimal:
 
 
 class TestParseCounts:
-    def test_parse_resources_counted(self, multi_resource_yaml):
-        result = parse_template(multi_resource_yaml)
+    def test_parse_resources_counted(self, cached_parse, multi_resource_yaml):
+        result = cached_parse(multi_resource_yaml)
         assert result["resource_count"] == 2
         assert sorted(result["resource_names"]) == ["bucketA", "bucketB"]
 
-    def test_parse_variables_counted(self, multi_resource_yaml):
-        result = parse_template(multi_resource_yaml)
+    def test_parse_variables_counted(self, cached_parse, multi_resource_yaml):
+        result = cached_parse(multi_resource_yaml)
         assert result["variable_count"] == 1
         assert result["variable_names"] == ["greeting"]
 
-    def test_parse_outputs_counted(self, multi_resource_yaml):
-        result = parse_template(multi_resource_yaml)
+    def test_parse_outputs_counted(self, cached_parse, multi_resource_yaml):
+        result = cached_parse(multi_resource_yaml)
         assert result["output_count"] == 2
         assert sorted(result["output_names"]) == ["nameA", "nameB"]
 
@@ -71,8 +71,8 @@ components:
 
 
 class TestParseDiagnostics:
-    def test_parse_diagnostics_no_errors(self, simple_yaml):
-        result = parse_template(simple_yaml)
+    def test_parse_diagnostics_no_errors(self, cached_parse, simple_yaml):
+        result = cached_parse(simple_yaml)
         assert result["has_errors"] is False
         assert result["diagnostics"] == []
 
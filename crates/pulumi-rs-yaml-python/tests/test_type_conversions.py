@@ -2,18 +2,51 @@
 
 """Tests for Python ↔ Rust type conversion round-trips.
 
-Exercises py_to_value and value_to_py via evaluate_builtin("select", [0, [value]]).
+Exercises py_to_value and value_to_py via evaluate_builtin("select", [0, [value]]),
+or for a whole batch at once via evaluate_builtin("select_many", [indices, values]).
 """
 
+import os
+import time
+
 import pytest
 from pulumi_yaml_rs import evaluate_builtin
 
+CANONICAL_VALUES = [
+    None, True, False, 42, 3.14, "hello", [1, "a", True], {"key": "value"},
+    {"a": [1, {"b": "c"}]},
+]
+
+
+def _bench_iterations():
+    """Opt-in FFI throughput run size, e.g. PULUMI_YAML_RS_BENCH=100000; 0 if unset or invalid."""
+    try:
+        return int(os.environ.get("PULUMI_YAML_RS_BENCH", "0") or 0)
+    except ValueError:
+        return 0
+
 
 def roundtrip(value):
     """Send a value through Python → Rust → Python via select(0, [value])."""
     return evaluate_builtin("select", [0, [value]])
 
 
+def roundtrip_many(values):
+    """Send a list of values through the boundary in a single select_many call."""
+    return evaluate_builtin("select_many", [list(range(len(values))), values])
+
+
+def _bench_roundtrip(values, n):
+    """Round-trip every value n times; returns conversions per second."""
+    args = [[0, [v]] for v in values]
+    select = evaluate_builtin
+    start = time.perf_counter()
+    for _ in range(n):
+        for a in args:
+            select("select", a)
+    return n * len(args) / (time.perf_counter() - start)
+
+
 class TestTypeConversions:
     def test_none_roundtrip(self):
         assert roundtrip(None) is None
@@ -49,3 +82,21 @@ class TestTypeConversions:
         value = {"a": [1, {"b": "c"}]}
         result = roundtrip(value)
         assert result == value
+
+    def test_batch_roundtrip(self):
+        result = roundtrip_many(CANONICAL_VALUES)
+        assert result == CANONICAL_VALUES
+        assert [type(v) for v in result] == [type(v) for v in CANONICAL_VALUES]
+
+    def test_batch_roundtrip_rejects_non_list_indices(self):
+        with pytest.raises(ValueError):
+            evaluate_builtin("select_many", [0, CANONICAL_VALUES])
+
+
+@pytest.mark.skipif(
+    not _bench_iterations(), reason="set PULUMI_YAML_RS_BENCH to an iteration count to run",
+)
+def test_roundtrip_throughput(record_property):
+    rate = _bench_roundtrip(CANONICAL_VALUES, _bench_iterations())
+    record_property("roundtrip_conversions_per_s", round(rate))
+    assert rate > 0
@@ -0,0 +1,62 @@
+# Copyright (c) 2024-2026 Lituus-io. All rights reserved.
+
+"""Shared constants and pulumi CLI helpers for the GCP E2E test modules.
+
+Kept out of the test modules so one E2E module can use them without importing
+(and re-collecting) another.
+"""
+
+import collections
+import subprocess
+import threading
+
+GCP_PROJECT = "spacy-muffin-lab-5a292e"
+GCP_REGION = "us-central1"
+
+
+def run_pulumi(args: list[str], *, cwd: str, env: dict) -> subprocess.CompletedProcess:
+    """Run a pulumi CLI command, capturing output."""
+    cmd = ["pulumi"] + args + ["--non-interactive"]
+    return subprocess.run(
+        cmd,
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+
+
+_TAIL_LINES = 200
+
+
+def stream_pulumi(
+    args: list[str], *, cwd: str, env: dict, needles: tuple[str, ...] = (),
+) -> tuple[subprocess.CompletedProcess, set[str]]:
+    """Run a pulumi CLI command, scanning its merged output line by line.
+
+    Only the last ``_TAIL_LINES`` lines are kept (as ``stdout``, for failure
+    messages). Also returns the subset of ``needles`` seen in the output.
+    """
+    cmd = ["pulumi"] + args + ["--non-interactive"]
+    tail = collections.deque(maxlen=_TAIL_LINES)
+    seen = set()
+    with subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    ) as proc:
+        watchdog = threading.Timer(300, proc.kill)
+        watchdog.start()
+        try:
+            for line in proc.stdout:
+                tail.append(line)
+                seen.update(n for n in needles if n in line)
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+    return subprocess.CompletedProcess(cmd, returncode, stdout="".join(tail), stderr=""), seen
@@ -5,24 +5,31 @@
 import os
 import json
 import shutil
+import stat
 import subprocess
 import tempfile
 import time
+import warnings
+from pathlib import Path
 
 import pytest
 
 
 def _find_project_root():
     """Walk up from this file to find the workspace root (contains Cargo.toml)."""
-    d = os.path.dirname(os.path.abspath(__file__))
-    for _ in range(10):
-        if os.path.isfile(os.path.join(d, "Cargo.toml")):
-            return d
-        d = os.path.dirname(d)
+    here = Path(__file__).resolve().parent
+    for d in [here, *here.parents][:10]:
+        if (d / "Cargo.toml").is_file():
+            return os.fspath(d)
     return None
 
 
 PROJECT_ROOT = _find_project_root()
+RUST_BINARY = (
+    os.path.join(PROJECT_ROOT, "target", "release", "pulumi-language-yaml")
+    if PROJECT_ROOT
+    else None
+)
 
 
 @pytest.fixture(scope="session")
@@ -33,8 +40,12 @@ def project_root():
 @pytest.fixture(scope="session")
 def rust_binary(project_root):
     """Path to the built pulumi-language-yaml binary. Skips if not found."""
-    binary = os.path.join(project_root, "target", "release", "pulumi-language-yaml")
-    if not os.path.isfile(binary):
+    binary = RUST_BINARY
+    try:
+        found = binary is not None and stat.S_ISREG(os.stat(binary).st_mode)
+    except (FileNotFoundError, NotADirectoryError):
+        found = False
+    if not found:
         pytest.skip(f"Rust binary not found at {binary} — run `cargo build --release` first")
     return binary
 
@@ -61,6 +72,33 @@ def gcp_credentials():
     pytest.skip("No GCP credentials available (set GOOGLE_APPLICATION_CREDENTIALS or run `gcloud auth application-default login`)")
 
 
+@pytest.fixture(scope="module")
+def gcp_access_token(gcp_credentials):
+    """OAuth access token minted per E2E module from ``gcp_credentials``.
+
+    Exported as GOOGLE_OAUTH_ACCESS_TOKEN, it lets every provider process skip
+    its own token exchange. The token is never refreshed, so it is minted per
+    module (well inside its one-hour lifetime) rather than once per session.
+    Returns None (providers mint their own) when google-auth is not installed
+    or the credentials cannot be exchanged; the latter is reported as a warning.
+    """
+    try:
+        import google.auth
+        from google.auth.exceptions import DefaultCredentialsError, RefreshError
+        from google.auth.transport.requests import Request
+    except ImportError:
+        return None
+    try:
+        creds, _ = google.auth.load_credentials_from_file(
+            gcp_credentials, scopes=["https://www.googleapis.com/auth/cloud-platform"],
+        )
+        creds.refresh(Request())
+    except (DefaultCredentialsError, RefreshError) as e:
+        warnings.warn(f"could not mint a GCP access token from {gcp_credentials}: {e}")
+        return None
+    return creds.token
+
+
 @pytest.fixture(scope="session")
 def pulumi_cli():
     """Ensure pulumi CLI is available."""
@@ -68,3 +106,13 @@ def pulumi_cli():
     if path is None:
         pytest.skip("pulumi CLI not found on PATH")
     return path
+
+
+@pytest.fixture(scope="session")
+def pulumi_file_backend(tmp_path_factory):
+    """file:// backend URL shared by every E2E module in the session.
+
+    Exported through PULUMI_BACKEND_URL rather than `pulumi login`, which
+    would rewrite the user's global ~/.pulumi credentials.
+    """
+    return tmp_path_factory.mktemp("pulumi-backend").as_uri()
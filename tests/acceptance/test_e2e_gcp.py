@@ -18,56 +18,64 @@ Usage:
 import json
 import os
 import shutil
+import string
 import subprocess
 import tempfile
 import time
+import warnings
 
 import pytest
 
+from _gcp_common import run_pulumi, stream_pulumi, GCP_PROJECT, GCP_REGION
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-GCP_PROJECT = "spacy-muffin-lab-5a292e"
-GCP_REGION = "us-central1"
 STACK_NAME = "e2e-test"
 
 
-def _make_pulumi_yaml(bucket_name: str) -> str:
-    return f"""\
+def _memory_backed_tmp_root() -> str | None:
+    """A tmpfs directory for E2E work dirs, sparing pulumi's state writes an fsync.
+
+    Returns None (the platform default temp dir) when none is available.
+    """
+    for root in (os.environ.get("XDG_RUNTIME_DIR"), "/dev/shm"):
+        if root and os.path.isdir(root) and os.access(root, os.W_OK):
+            return root
+    return None
+
+
+TMP_ROOT = _memory_backed_tmp_root()
+
+
+_PULUMI_YAML_TPL = string.Template("""\
 name: e2e-gcp-bucket-test
 runtime: yaml
 description: E2E test for pulumi-rs-yaml — creates a real GCS bucket
 config:
   gcp:project:
-    value: {GCP_PROJECT}
+    value: $project
   gcp:region:
-    value: {GCP_REGION}
+    value: $region
 resources:
   testBucket:
     type: gcp:storage:Bucket
     properties:
-      name: {bucket_name}
+      name: $bucket
       location: US
       forceDestroy: true
       uniformBucketLevelAccess: true
 outputs:
-  bucketName: ${{testBucket.name}}
-  bucketUrl: ${{testBucket.url}}
-"""
+  bucketName: $${testBucket.name}
+  bucketUrl: $${testBucket.url}
+""")
 
 
-def run_pulumi(args: list[str], *, cwd: str, env: dict) -> subprocess.CompletedProcess:
-    """Run a pulumi CLI command, capturing output."""
-    cmd = ["pulumi"] + args + ["--non-interactive"]
-    return subprocess.run(
-        cmd,
-        cwd=cwd,
-        env=env,
-        capture_output=True,
-        text=True,
-        timeout=300,
+def _make_pulumi_yaml(bucket_name: str) -> str:
+    return _PULUMI_YAML_TPL.substitute(
+        bucket=bucket_name, project=GCP_PROJECT, region=GCP_REGION,
     )
 
 
@@ -78,6 +86,16 @@ def run_pulumi(args: list[str], *, cwd: str, env: dict) -> subprocess.CompletedP
 class _E2EState:
     """Holds state shared across the ordered tests in this module."""
 
+    __slots__ = (
+        "work_dir",
+        "env",
+        "bucket_name",
+        "preview_result",
+        "up_result",
+        "outputs",
+        "destroy_result",
+    )
+
     def __init__(self):
         self.work_dir: str | None = None
         self.env: dict | None = None
@@ -96,14 +114,14 @@ _state = _E2EState()
 # ---------------------------------------------------------------------------
 
 @pytest.fixture(scope="module", autouse=True)
-def e2e_environment(rust_binary, gcp_credentials, pulumi_cli):
+def e2e_environment(rust_binary, gcp_credentials, gcp_access_token, pulumi_cli):
     """Set up the temp project directory, PATH, and env; tear down after all tests."""
     # Unique bucket name
     bucket_name = f"pulumi-rs-e2e-test-{int(time.time())}"
     _state.bucket_name = bucket_name
 
     # Create temp directory with Pulumi.yaml
-    work_dir = tempfile.mkdtemp(prefix="pulumi-e2e-")
+    work_dir = tempfile.mkdtemp(prefix="pulumi-e2e-", dir=TMP_ROOT)
     _state.work_dir = work_dir
 
     pulumi_yaml = _make_pulumi_yaml(bucket_name)
@@ -120,25 +138,42 @@ def e2e_environment(rust_binary, gcp_credentials, pulumi_cli):
     env["PATH"] = bin_dir + os.pathsep + env.get("PATH", "")
     env["PULUMI_BACKEND_URL"] = f"file://{work_dir}/.pulumi"
     env["PULUMI_CONFIG_PASSPHRASE"] = "e2e-test"
+    # Each CLI start otherwise makes a network round trip for a version check.
+    env["PULUMI_SKIP_UPDATE_CHECK"] = "true"
     env["GOOGLE_APPLICATION_CREDENTIALS"] = gcp_credentials
+    if gcp_access_token:
+        env["GOOGLE_OAUTH_ACCESS_TOKEN"] = gcp_access_token
     _state.env = env
 
     # Create local backend directory
     os.makedirs(os.path.join(work_dir, ".pulumi"), exist_ok=True)
 
     # Init stack
-    result = run_pulumi(["stack", "init", STACK_NAME], cwd=work_dir, env=env)
+    # passphrase is already the default on a file:// backend; pinned explicitly.
+    result = run_pulumi(
+        ["stack", "init", STACK_NAME, "--secrets-provider=passphrase"],
+        cwd=work_dir,
+        env=env,
+    )
     assert result.returncode == 0, f"stack init failed:\n{result.stderr}"
 
     yield
 
-    # ---- Teardown: best-effort destroy + cleanup ----
-    # If destroy wasn't already run by the test, run it now
-    if _state.destroy_result is None:
-        run_pulumi(["destroy", "--yes"], cwd=work_dir, env=env)
-
-    run_pulumi(["stack", "rm", STACK_NAME, "--yes"], cwd=work_dir, env=env)
-    shutil.rmtree(work_dir, ignore_errors=True)
+    # ---- Teardown: destroy unless the test already did so successfully ----
+    destroyed = _state.destroy_result
+    if destroyed is None or destroyed.returncode != 0:
+        destroyed = run_pulumi(["destroy", "--yes", "--skip-preview"], cwd=work_dir, env=env)
+
+    if destroyed.returncode == 0:
+        # The file backend lives under work_dir, so removing the directory also
+        # removes the stack — no separate `pulumi stack rm` process needed.
+        shutil.rmtree(work_dir, ignore_errors=True)
+    else:
+        # work_dir is not managed by pytest, so the backend survives the run.
+        warnings.warn(
+            f"destroy failed; keeping stack {STACK_NAME!r} in backend "
+            f"{env['PULUMI_BACKEND_URL']} (project dir {work_dir}) for manual cleanup"
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -150,20 +185,18 @@ class TestE2EGCP:
 
     def test_preview_succeeds(self):
         """Rust plugin is discovered and preview produces a valid plan."""
-        result = run_pulumi(["preview"], cwd=_state.work_dir, env=_state.env)
+        # Output is scanned as it arrives; only a tail is kept for failures.
+        result, seen = stream_pulumi(
+            ["preview"], cwd=_state.work_dir, env=_state.env,
+            needles=("testBucket", "Bucket"),
+        )
         _state.preview_result = result
 
-        # Print output for debugging
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
-
         assert result.returncode == 0, (
-            f"pulumi preview failed (rc={result.returncode}):\n{result.stderr}"
+            f"pulumi preview failed (rc={result.returncode}):\n{result.stdout}"
         )
         # Preview should mention the bucket resource
-        combined = result.stdout + result.stderr
-        assert "testBucket" in combined or "Bucket" in combined, (
+        assert seen, (
             "Preview output does not mention the bucket resource"
         )
 
@@ -173,15 +206,14 @@ class TestE2EGCP:
             "Skipping deploy — preview did not succeed"
         )
 
-        result = run_pulumi(["up", "--yes"], cwd=_state.work_dir, env=_state.env)
+        # test_preview_succeeds already ran the preview; don't compute it twice.
+        result = run_pulumi(
+            ["up", "--yes", "--skip-preview"], cwd=_state.work_dir, env=_state.env,
+        )
         _state.up_result = result
 
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
-
         assert result.returncode == 0, (
-            f"pulumi up failed (rc={result.returncode}):\n{result.stderr}"
+            f"pulumi up failed (rc={result.returncode}):\n{result.stdout}\n{result.stderr}"
         )
 
     def test_outputs_valid(self):
@@ -196,9 +228,8 @@ class TestE2EGCP:
             env=_state.env,
         )
 
-        print(result.stdout)
         assert result.returncode == 0, (
-            f"stack output failed (rc={result.returncode}):\n{result.stderr}"
+            f"stack output failed (rc={result.returncode}):\n{result.stdout}\n{result.stderr}"
         )
 
         outputs = json.loads(result.stdout)
@@ -220,15 +251,13 @@ class TestE2EGCP:
             "Skipping destroy — deploy did not succeed"
         )
 
-        result = run_pulumi(["destroy", "--yes"], cwd=_state.work_dir, env=_state.env)
+        result = run_pulumi(
+            ["destroy", "--yes", "--skip-preview"], cwd=_state.work_dir, env=_state.env,
+        )
         _state.destroy_result = result
 
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
-
         assert result.returncode == 0, (
-            f"pulumi destroy failed (rc={result.returncode}):\n{result.stderr}"
+            f"pulumi destroy failed (rc={result.returncode}):\n{result.stdout}\n{result.stderr}"
         )
 
         # Verify no resources remain
@@ -5,28 +5,36 @@ End-to-end test: Pulumi engine + Rust plugin + multi-file YAML + real GCP resour
 
 Verifies that the Rust language host correctly merges multiple Pulumi YAML files
 and handles cross-file resource references. Deploys 3 real GCS buckets defined
-across 3 files with cross-file dependsOn.
+across 2 files with cross-file dependsOn and outputs. (Merges of three or more
+files are covered offline by the gcp-multi-file / gcp-cross-file-dag fixtures.)
 
 File layout:
-  Pulumi.yaml          — project config + outputs (references resources from other files)
-  Pulumi.storage.yaml  — storageBucket resource
-  Pulumi.logging.yaml  — logBucket (dependsOn storageBucket) + archiveBucket
+  Pulumi.yaml      — project config, storageBucket, outputs (referencing both files)
+  Pulumi.aux.yaml  — logBucket (dependsOn storageBucket) + archiveBucket
 
 Usage:
     cd tests/acceptance
     GOOGLE_APPLICATION_CREDENTIALS=/path/to/creds.json pytest test_e2e_gcp_multifile.py -v -s
 """
 
+import dataclasses
 import json
 import os
+import re
 import shutil
+import string
 import subprocess
 import tempfile
 import time
+import uuid
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 import pytest
 
-from test_e2e_gcp import run_pulumi, GCP_PROJECT, GCP_REGION
+from _gcp_common import run_pulumi, stream_pulumi, GCP_PROJECT, GCP_REGION
 
 
 # ---------------------------------------------------------------------------
@@ -34,134 +42,236 @@ from test_e2e_gcp import run_pulumi, GCP_PROJECT, GCP_REGION
 # ---------------------------------------------------------------------------
 
 STACK_NAME = "e2e-multifile"
-
-
-def _make_main_yaml(suffix: str) -> str:
-    """Pulumi.yaml — config + outputs referencing resources from satellite files."""
-    return f"""\
+# Explicit engine parallelism, so storageBucket and archiveBucket (which are
+# independent) are always created and deleted concurrently.
+PARALLELISM = 10
+
+_BUCKETS = ("storageBucket", "logBucket", "archiveBucket")
+_OUTPUT_KEYS = frozenset(
+    f"{bucket}{suffix}" for bucket in _BUCKETS for suffix in ("Name", "Url")
+)
+
+# Environment forwarded to the pulumi CLI (see multifile_environment).
+_ENV_PASSTHROUGH = frozenset({
+    "HOME", "USER", "TMPDIR", "LANG", "LC_ALL", "SSL_CERT_FILE",
+    "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY", "http_proxy", "https_proxy", "no_proxy",
+})
+_ENV_PREFIXES = ("PULUMI_", "GOOGLE_", "CLOUDSDK_")
+
+# One string output in the `Outputs:` block of `pulumi up`, e.g.
+#     storageBucketName: "pulumi-rs-mf-storage-123"
+_OUTPUT_LINE = re.compile(r'^\s+(?:[+~-]\s+)?(\w+)\s*:\s*(".*")\s*$')
+
+
+def _parse_outputs_block(text: str) -> dict:
+    """Collect the string stack outputs printed by `pulumi up`."""
+    outputs = {}
+    in_block = False
+    for line in text.splitlines():
+        if line.strip() == "Outputs:":
+            in_block = True
+        elif in_block:
+            m = _OUTPUT_LINE.match(line)
+            if m is None:
+                break
+            outputs[m.group(1)] = json.loads(m.group(2))
+    return outputs
+
+
+# Templates for the two project files. Every _make_* helper returns bytes
+# ready for os.write.
+_MAIN_TPL = string.Template("""\
 name: e2e-gcp-multifile-test
 runtime: yaml
 description: E2E multi-file test — cross-file resource references
 config:
   gcp:project:
-    value: {GCP_PROJECT}
+    value: $project
   gcp:region:
-    value: {GCP_REGION}
-outputs:
-  storageBucketName: ${{storageBucket.name}}
-  storageBucketUrl: ${{storageBucket.url}}
-  logBucketName: ${{logBucket.name}}
-  logBucketUrl: ${{logBucket.url}}
-  archiveBucketName: ${{archiveBucket.name}}
-  archiveBucketUrl: ${{archiveBucket.url}}
-"""
-
-
-def _make_storage_yaml(suffix: str) -> str:
-    """Pulumi.storage.yaml — defines storageBucket."""
-    return f"""\
+    value: $region
 resources:
   storageBucket:
     type: gcp:storage:Bucket
     properties:
-      name: pulumi-rs-mf-storage-{suffix}
+      name: pulumi-rs-mf-storage-$suffix
       location: US
       forceDestroy: true
       uniformBucketLevelAccess: true
-"""
-
-
-def _make_logging_yaml(suffix: str) -> str:
-    """Pulumi.logging.yaml — defines logBucket (depends on storageBucket) + archiveBucket."""
-    return f"""\
+outputs:
+  storageBucketName: $${storageBucket.name}
+  storageBucketUrl: $${storageBucket.url}
+  logBucketName: $${logBucket.name}
+  logBucketUrl: $${logBucket.url}
+  archiveBucketName: $${archiveBucket.name}
+  archiveBucketUrl: $${archiveBucket.url}
+""")
+
+_AUX_TPL = string.Template("""\
 resources:
   logBucket:
     type: gcp:storage:Bucket
     properties:
-      name: pulumi-rs-mf-logs-{suffix}
+      name: pulumi-rs-mf-logs-$suffix
       location: US
       forceDestroy: true
       uniformBucketLevelAccess: true
     options:
       dependsOn:
-        - ${{storageBucket}}
+        - $${storageBucket}
   archiveBucket:
     type: gcp:storage:Bucket
     properties:
-      name: pulumi-rs-mf-archive-{suffix}
+      name: pulumi-rs-mf-archive-$suffix
       location: US
       forceDestroy: true
       uniformBucketLevelAccess: true
-"""
+""")
+
+
+def _make_main_yaml(suffix: str) -> bytes:
+    """Pulumi.yaml — config, storageBucket, and outputs spanning both files."""
+    return _MAIN_TPL.substitute(
+        project=GCP_PROJECT, region=GCP_REGION, suffix=suffix,
+    ).encode()
+
+
+def _make_aux_yaml(suffix: str) -> bytes:
+    """Pulumi.aux.yaml — logBucket (depends on storageBucket) + archiveBucket."""
+    return _AUX_TPL.substitute(suffix=suffix).encode()
 
 
 # ---------------------------------------------------------------------------
 # Shared state
 # ---------------------------------------------------------------------------
 
+@dataclasses.dataclass(slots=True)
 class _MFState:
-    """Holds state shared across the ordered multi-file tests."""
-
-    def __init__(self):
-        self.work_dir: str | None = None
-        self.env: dict | None = None
-        self.suffix: str | None = None
-        self.preview_result: subprocess.CompletedProcess | None = None
-        self.up_result: subprocess.CompletedProcess | None = None
-        self.outputs: dict | None = None
-        self.destroy_result: subprocess.CompletedProcess | None = None
-
-
-_state = _MFState()
+    """Holds state shared across the ordered tests of one class."""
+
+    work_dir: str | None = None
+    env: dict | None = None
+    stack_name: str | None = None
+    suffix: str | None = None
+    up_result: subprocess.CompletedProcess | None = None
+    outputs: dict | None = None
+    destroy_result: subprocess.CompletedProcess | None = None
+
+
+def _preserve_for_cleanup(work_dir: str, backend_url: str) -> str:
+    """Copy the project and its file backend out of pytest's basetemp.
+
+    Both live under the basetemp, which pytest prunes (or, with --basetemp,
+    wipes at the start of the next run); after a failed destroy the backend
+    is the only state for buckets still live in GCP. Returns the copy's path.
+    """
+    kept = tempfile.mkdtemp(prefix="pulumi-e2e-mf-kept-")
+    backend_dir = url2pathname(urlparse(backend_url).path)
+    shutil.copytree(backend_dir, os.path.join(kept, "backend"), symlinks=True)
+    shutil.copytree(
+        work_dir, os.path.join(kept, "project"),
+        symlinks=True, ignore=shutil.ignore_patterns("bin"),
+    )
+    return kept
 
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture(scope="module", autouse=True)
-def multifile_environment(rust_binary, gcp_credentials, pulumi_cli):
-    """Set up temp project with 3 YAML files; tear down after all tests."""
-    suffix = str(int(time.time()))
-    _state.suffix = suffix
-
-    work_dir = tempfile.mkdtemp(prefix="pulumi-e2e-mf-")
-    _state.work_dir = work_dir
-
-    # Write the 3 YAML files
+@pytest.fixture(scope="class")
+def multifile_environment(
+    rust_binary, gcp_credentials, gcp_access_token, pulumi_cli, pulumi_file_backend,
+    tmp_path_factory, request,
+):
+    """Set up temp project with 2 YAML files; tear down after the class."""
+    state = _MFState()
+    # One stack per class in the shared backend, so classes never collide.
+    stack_name = f"{STACK_NAME}-{request.cls.__name__.lower()}-{uuid.uuid4().hex[:8]}"
+    state.stack_name = stack_name
+    # The pid keeps bucket names distinct across concurrent xdist workers.
+    suffix = f"{int(time.time())}-{os.getpid()}"
+    state.suffix = suffix
+
+    # pytest owns the directory and prunes old basetemps itself.
+    work_dir = str(tmp_path_factory.mktemp("pulumi-e2e-mf"))
+    state.work_dir = work_dir
+
+    # Write the YAML files concurrently
     files = {
         "Pulumi.yaml": _make_main_yaml(suffix),
-        "Pulumi.storage.yaml": _make_storage_yaml(suffix),
-        "Pulumi.logging.yaml": _make_logging_yaml(suffix),
+        "Pulumi.aux.yaml": _make_aux_yaml(suffix),
     }
-    for name, content in files.items():
-        with open(os.path.join(work_dir, name), "w") as f:
-            f.write(content)
 
-    # Symlink binary onto PATH
+    def _write(item):
+        # Raw fd write: one syscall, no text-layer encode/newline pass.
+        name, content = item
+        fd = os.open(
+            os.path.join(work_dir, name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644,
+        )
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+
+    with ThreadPoolExecutor(max_workers=len(files)) as ex:
+        list(ex.map(_write, files.items()))
+
+    # Put the binary on PATH. A hardlink spares the engine a readlink on each
+    # plugin launch; fall back to a symlink across filesystems.
     bin_dir = os.path.join(work_dir, "bin")
     os.makedirs(bin_dir)
-    os.symlink(rust_binary, os.path.join(bin_dir, "pulumi-language-yaml"))
-
-    env = os.environ.copy()
-    env["PATH"] = bin_dir + os.pathsep + env.get("PATH", "")
-    env["PULUMI_BACKEND_URL"] = f"file://{work_dir}/.pulumi"
+    plugin = os.path.join(bin_dir, "pulumi-language-yaml")
+    try:
+        os.link(rust_binary, plugin)
+    except OSError:
+        os.symlink(rust_binary, plugin)
+
+    # Only what pulumi, the plugin and the GCP SDK read, to keep the envp each
+    # CLI invocation marshals small.
+    env = {
+        k: v for k, v in os.environ.items()
+        if k in _ENV_PASSTHROUGH or k.startswith(_ENV_PREFIXES)
+    }
+    env.setdefault("LANG", "C.UTF-8")
+    env["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+    env["PULUMI_BACKEND_URL"] = pulumi_file_backend
     env["PULUMI_CONFIG_PASSPHRASE"] = "e2e-test"
+    # Each CLI start otherwise makes a network round trip for a version check.
+    env["PULUMI_SKIP_UPDATE_CHECK"] = "true"
     env["GOOGLE_APPLICATION_CREDENTIALS"] = gcp_credentials
-    _state.env = env
-
-    os.makedirs(os.path.join(work_dir, ".pulumi"), exist_ok=True)
-
-    result = run_pulumi(["stack", "init", STACK_NAME], cwd=work_dir, env=env)
+    if gcp_access_token:
+        env["GOOGLE_OAUTH_ACCESS_TOKEN"] = gcp_access_token
+    state.env = env
+
+    # passphrase is already the default on a file:// backend; pinned explicitly.
+    result = run_pulumi(
+        ["stack", "init", stack_name, "--secrets-provider=passphrase"],
+        cwd=work_dir,
+        env=env,
+    )
     assert result.returncode == 0, f"stack init failed:\n{result.stderr}"
 
-    yield
-
-    # Teardown
-    if _state.destroy_result is None:
-        run_pulumi(["destroy", "--yes"], cwd=work_dir, env=env)
-    run_pulumi(["stack", "rm", STACK_NAME, "--yes"], cwd=work_dir, env=env)
-    shutil.rmtree(work_dir, ignore_errors=True)
+    yield state
+
+    # Teardown: destroy only if the test didn't already do it successfully.
+    # The stack is removed only once a destroy has succeeded; otherwise it is
+    # the only record of the buckets still live in GCP, so it is kept.
+    destroyed = state.destroy_result
+    if destroyed is None or destroyed.returncode != 0:
+        destroyed = run_pulumi(
+            ["destroy", "--yes", "--skip-preview", "--parallel", str(PARALLELISM)],
+            cwd=work_dir,
+            env=env,
+        )
+    if destroyed.returncode == 0:
+        run_pulumi(["stack", "rm", stack_name, "--yes"], cwd=work_dir, env=env)
+    else:
+        kept = _preserve_for_cleanup(work_dir, pulumi_file_backend)
+        warnings.warn(
+            f"destroy failed; stack {stack_name!r} copied to {kept} for manual cleanup: "
+            f"cd {kept}/project && PULUMI_BACKEND_URL=file://{kept}/backend "
+            f"pulumi destroy --stack {stack_name}"
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -171,109 +281,125 @@ def multifile_environment(rust_binary, gcp_credentials, pulumi_cli):
 class TestE2EGCPMultiFile:
     """Ordered E2E tests for multi-file Pulumi YAML + GCP."""
 
-    def test_preview_succeeds(self):
-        """Multi-file merge works and preview shows all 3 buckets."""
-        result = run_pulumi(["preview"], cwd=_state.work_dir, env=_state.env)
-        _state.preview_result = result
-
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
+    def test_deploy_and_resources_present(self, multifile_environment):
+        """pulumi up merges both files and creates every bucket across them.
+
+        The per-resource create lines in the update output cover what a
+        separate `pulumi preview` would have checked.
+        """
+        # Create the independent buckets concurrently; the combined preview
+        # pass is redundant since the creates themselves are asserted below.
+        # Output is scanned as it arrives; only a tail is kept for failures.
+        result, seen = stream_pulumi(
+            ["up", "--yes", "--skip-preview", "--parallel", str(PARALLELISM)],
+            cwd=multifile_environment.work_dir,
+            env=multifile_environment.env,
+            needles=_BUCKETS + ("4 created",),
+        )
+        multifile_environment.up_result = result
 
         assert result.returncode == 0, (
-            f"pulumi preview failed (rc={result.returncode}):\n{result.stderr}"
+            f"pulumi up failed (rc={result.returncode}):\n{result.stdout}"
         )
 
-        combined = result.stdout + result.stderr
-        # All three resources should appear in the preview
-        for resource in ("storageBucket", "logBucket", "archiveBucket"):
-            assert resource in combined, (
-                f"Preview output missing resource '{resource}'"
+        # All three resources should appear in the update
+        for resource in _BUCKETS:
+            assert resource in seen, (
+                f"Update output missing resource '{resource}'"
             )
 
-    def test_deploy_creates_buckets(self):
-        """pulumi up creates all 3 GCS buckets across files."""
-        assert _state.preview_result is not None and _state.preview_result.returncode == 0, (
-            "Skipping deploy — preview did not succeed"
-        )
-
-        result = run_pulumi(["up", "--yes"], cwd=_state.work_dir, env=_state.env)
-        _state.up_result = result
-
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
-
-        assert result.returncode == 0, (
-            f"pulumi up failed (rc={result.returncode}):\n{result.stderr}"
-        )
-
         # Should have created 4 resources: stack + 3 buckets
-        combined = result.stdout + result.stderr
-        assert "4 created" in combined, (
-            f"Expected '4 created' in output, got:\n{combined}"
+        assert "4 created" in seen, (
+            f"Expected '4 created' in output, got:\n{result.stdout}"
         )
 
-    def test_outputs_valid(self):
+        # up already printed the stack outputs; keep them for test_outputs_valid
+        # only if all six were parsed, otherwise it falls back to `stack output`.
+        parsed = _parse_outputs_block(result.stdout)
+        multifile_environment.outputs = parsed if _OUTPUT_KEYS <= parsed.keys() else None
+
+    def test_outputs_valid(self, multifile_environment):
         """Stack outputs contain all 3 bucket names and URLs from cross-file references."""
-        assert _state.up_result is not None and _state.up_result.returncode == 0, (
+        up = multifile_environment.up_result
+        assert up is not None and up.returncode == 0, (
             "Skipping output check — deploy did not succeed"
         )
 
-        result = run_pulumi(
-            ["stack", "output", "--json"],
-            cwd=_state.work_dir,
-            env=_state.env,
-        )
+        outputs = multifile_environment.outputs
+        if outputs is None:
+            # up's Outputs: block was missing or incomplete; ask the backend instead.
+            result = run_pulumi(
+                ["stack", "output", "--json"],
+                cwd=multifile_environment.work_dir,
+                env=multifile_environment.env,
+            )
 
-        print(result.stdout)
-        assert result.returncode == 0, (
-            f"stack output failed (rc={result.returncode}):\n{result.stderr}"
-        )
+            assert result.returncode == 0, (
+                f"stack output failed (rc={result.returncode}):\n"
+                f"{result.stdout}\n{result.stderr}"
+            )
 
-        outputs = json.loads(result.stdout)
-        _state.outputs = outputs
+            outputs = json.loads(result.stdout)
+            multifile_environment.outputs = outputs
 
-        suffix = _state.suffix
+        suffix = multifile_environment.suffix
 
-        # Verify all 6 outputs
+        # Verify all 6 outputs (a missing key shows up as None / '')
         expected = {
             "storageBucketName": f"pulumi-rs-mf-storage-{suffix}",
             "logBucketName": f"pulumi-rs-mf-logs-{suffix}",
             "archiveBucketName": f"pulumi-rs-mf-archive-{suffix}",
         }
         for key, expected_value in expected.items():
-            assert key in outputs, f"Missing '{key}' in outputs: {outputs}"
-            assert outputs[key] == expected_value, (
-                f"Expected {key}='{expected_value}', got '{outputs[key]}'"
+            got = outputs.get(key)
+            assert got == expected_value, (
+                f"Expected {key}='{expected_value}', got {got!r} in outputs: {outputs}"
             )
 
-        url_keys = ("storageBucketUrl", "logBucketUrl", "archiveBucketUrl")
-        for key in url_keys:
-            assert key in outputs, f"Missing '{key}' in outputs: {outputs}"
-            assert outputs[key].startswith("gs://"), (
-                f"Expected {key} to start with 'gs://', got '{outputs[key]}'"
+        for key in ("storageBucketUrl", "logBucketUrl", "archiveBucketUrl"):
+            got = outputs.get(key, "")
+            assert got.startswith("gs://"), (
+                f"Expected {key} to start with 'gs://', got {got!r}"
             )
 
-    def test_destroy_cleans_up(self):
+    def test_postup_preview_noop(self, multifile_environment):
+        """A preview right after up sees no changes: the merged program is stable."""
+        up = multifile_environment.up_result
+        assert up is not None and up.returncode == 0, (
+            "Skipping idempotency check — deploy did not succeed"
+        )
+
+        result = run_pulumi(
+            ["preview", "--expect-no-changes"],
+            cwd=multifile_environment.work_dir,
+            env=multifile_environment.env,
+        )
+
+        assert result.returncode == 0, (
+            f"preview after up reported changes (rc={result.returncode}):\n"
+            f"{result.stdout}\n{result.stderr}"
+        )
+
+    def test_destroy_cleans_up(self, multifile_environment):
         """pulumi destroy removes all 3 buckets."""
-        assert _state.up_result is not None and _state.up_result.returncode == 0, (
+        up = multifile_environment.up_result
+        assert up is not None and up.returncode == 0, (
             "Skipping destroy — deploy did not succeed"
         )
 
-        result = run_pulumi(["destroy", "--yes"], cwd=_state.work_dir, env=_state.env)
-        _state.destroy_result = result
-
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
+        result, seen = stream_pulumi(
+            ["destroy", "--yes", "--skip-preview", "--parallel", str(PARALLELISM)],
+            cwd=multifile_environment.work_dir,
+            env=multifile_environment.env,
+            needles=("4 deleted",),
+        )
+        multifile_environment.destroy_result = result
 
         assert result.returncode == 0, (
-            f"pulumi destroy failed (rc={result.returncode}):\n{result.stderr}"
+            f"pulumi destroy failed (rc={result.returncode}):\n{result.stdout}"
         )
 
         # Should have deleted 4 resources: stack + 3 buckets
-        combined = result.stdout + result.stderr
-        assert "4 deleted" in combined, (
-            f"Expected '4 deleted' in output, got:\n{combined}"
+        assert "4 deleted" in seen, (
+            f"Expected '4 deleted' in output, got:\n{result.stdout}"
         )